@@ -0,0 +1,230 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from lxml import etree
+import io
+import re
+from itertools import zip_longest
+
+XML_DECLARATION = re.compile(rb"<\?xml", re.IGNORECASE)
+SPREADSHEET_ROOT = re.compile(rb"<workbook|urn:schemas-microsoft-com:office:spreadsheet", re.IGNORECASE)
+
+SS_NS = "{urn:schemas-microsoft-com:office:spreadsheet}"
+SS_TABLE = f"{SS_NS}Table"
+SS_ROW = f"{SS_NS}Row"
+SS_CELL = f"{SS_NS}Cell"
+SS_DATA = f"{SS_NS}Data"
+SS_ROW_DATA = etree.XPath(
+    "ss:Cell/ss:Data",
+    namespaces={"ss": "urn:schemas-microsoft-com:office:spreadsheet"},
+)
+
+
+def iter_row_chunks(data, chunk_size=10000):
+    # Yields lists of row values from the first Table, at most chunk_size rows at a time.
+    # Nothing is yielded when the document has no Table.
+    rows = []
+    for _, elem in etree.iterparse(
+        io.BytesIO(data), events=("end",), tag=(SS_TABLE, SS_ROW), remove_comments=True, remove_pis=True
+    ):
+        if elem.tag == SS_TABLE:
+            yield rows
+            return
+
+        cells = elem.findall(SS_CELL)
+        data_elems = SS_ROW_DATA(elem)
+        if len(data_elems) == len(cells):
+            # Every cell holds its single Data element, so read .text in order
+            rows.append([data_elem.text or "" for data_elem in data_elems])
+        else:
+            values = []
+            for cell in cells:
+                data_elem = cell.find(SS_DATA)
+                values.append(data_elem.text if data_elem is not None and data_elem.text else "")
+            rows.append(values)
+
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+        if len(rows) >= chunk_size:
+            yield rows
+            rows = []
+
+
+def row_chunk_batch(rows, headers):
+    columns = list(zip_longest(*rows))
+    if len(columns) > len(headers):
+        raise ValueError(f"{len(headers)} columns passed, passed data had {len(columns)} columns")
+    columns += [[None] * len(rows)] * (len(headers) - len(columns))
+
+    # Whitespace is trimmed per column by Arrow rather than per cell in Python
+    return pa.RecordBatch.from_arrays(
+        [pc.utf8_trim_whitespace(pa.array(column, type=pa.string())) for column in columns],
+        names=headers,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def parse_resource(name, data):
+    file_head = data[:2048]
+
+    is_xml = XML_DECLARATION.search(file_head) is not None and SPREADSHEET_ROOT.search(file_head) is not None
+
+    if is_xml:
+        headers = None
+        batches = []
+        table_found = False
+
+        for rows in iter_row_chunks(data):
+            table_found = True
+            if headers is None and rows:
+                headers, rows = rows[0], rows[1:]
+            if rows and headers:
+                batches.append(row_chunk_batch(rows, headers))
+
+        if not table_found:
+            return None, f"⚠️ Skipped {name} due to missing XML table."
+
+        if not batches:
+            return None, f"⚠️ Skipped {name} due to insufficient rows."
+
+        df = pa.Table.from_batches(batches).to_pandas(types_mapper=pd.ArrowDtype)
+    elif name.endswith(".csv"):
+        try:
+            df = pd.read_csv(io.BytesIO(data), engine="pyarrow", dtype_backend="pyarrow")
+        except ValueError:
+            # The pyarrow engine rejects rows with missing trailing fields; the C engine pads them
+            df = pd.read_csv(io.BytesIO(data), dtype_backend="pyarrow")
+    else:
+        try:
+            # Default backend: mixed date/text and number/text columns stay object, as with openpyxl
+            df = pd.read_excel(io.BytesIO(data), engine="calamine")
+        except ImportError:
+            df = pd.read_excel(io.BytesIO(data))
+
+    df.columns = df.columns.str.strip()
+
+    if "Title" not in df.columns:
+        return None, f"⚠️ Skipped {name} due to missing Title column."
+
+    if "Subject" not in df.columns:
+        return None, f"⚠️ Skipped {name} due to missing Subject column."
+
+    if "Teacher Name" not in df.columns:
+        if "Created By" in df.columns:
+            df.rename(columns={"Created By": "Teacher Name"}, inplace=True)
+        else:
+            return None, f"⚠️ Skipped {name} due to unknown teacher column."
+
+    # Arrow-backed strings let fill_null and utf8_trim_whitespace run as Arrow kernels
+    df["Teacher Name"] = df["Teacher Name"].astype("string[pyarrow]").fillna("").str.strip()
+    df = df[df["Teacher Name"] != ""]
+
+    if "Created Date" in df.columns:
+        df["Created Date"] = pd.to_datetime(df["Created Date"], errors="coerce")
+
+    return df, None
+
+
+@st.cache_data(show_spinner=False)
+def combine_resources(file_keys, _frames):
+    combined_df = pd.concat(_frames, ignore_index=True)
+    combined_df["Teacher Name"] = combined_df["Teacher Name"].astype("category")
+    combined_df["Subject"] = combined_df["Subject"].astype("category")
+    return combined_df
+
+
+def created_date_bounds(created_dates, mask):
+    values = created_dates.to_numpy()
+    if values.dtype.kind != "M":
+        created_dates = created_dates[mask].dropna()
+        return None if created_dates.empty else (created_dates.min(), created_dates.max())
+
+    # NaT is stored as the smallest int64, so reduce over the raw ticks and skip it
+    ticks = values.view("i8")[mask]
+    ticks = ticks[ticks != np.iinfo("i8").min]
+    if ticks.size == 0:
+        return None
+
+    unit = np.datetime_data(values.dtype)[0]
+    return pd.Timestamp(int(ticks.min()), unit=unit), pd.Timestamp(int(ticks.max()), unit=unit)
+
+
+def created_date_mask(created_dates, start_date, end_date):
+    values = created_dates.to_numpy()
+    if values.dtype.kind != "M":
+        return ((created_dates >= start_date) & (created_dates <= end_date)).to_numpy()
+
+    # NumPy datetime comparisons are False for NaT, matching the pandas comparison
+    return (values >= start_date.to_datetime64()) & (values <= end_date.to_datetime64())
+
+
+@st.cache_data(show_spinner=False)
+def build_summary(file_keys, filter_key, _filtered_df):
+    filtered_df = _filtered_df
+
+    # One hash pass over the categorical codes; both margins come from NumPy sums over its block
+    counts = (
+        filtered_df.groupby(["Teacher Name", "Subject"], observed=True, sort=False)
+        .size()
+        .unstack(fill_value=0)
+        .sort_index()
+        .sort_index(axis=1)
+    )
+    count_values = counts.to_numpy()
+    teacher_totals = count_values.sum(axis=1)
+    subject_totals = count_values.sum(axis=0)
+
+    teacher_summary = pd.DataFrame({"Teacher Name": counts.index, "Total Resources": teacher_totals})
+    teacher_summary = teacher_summary.sort_values("Total Resources", ascending=False)
+
+    subject_summary = pd.DataFrame({"Subject": counts.columns, "Total Resources": subject_totals})
+    subject_summary = subject_summary.sort_values("Total Resources", ascending=False)
+
+    summary = counts.reset_index()
+    summary["Total"] = teacher_totals
+    total_row = pd.DataFrame([["Total", *subject_totals, teacher_totals.sum()]], columns=summary.columns)
+    summary = pd.concat([summary, total_row], ignore_index=True)
+
+    # The charts only need the teacher rows, which counts and teacher_totals already hold
+    chart_data = counts
+    pie_data = pd.Series(teacher_totals, index=counts.index, name="Total")
+
+    return teacher_summary, subject_summary, summary, chart_data, pie_data
+
+
+@st.cache_data(show_spinner=False)
+def build_xlsx(file_keys, filter_key, display_cols, _filtered_df, _teacher_summary, _subject_summary, _summary):
+    # Assemble the xlsx in memory instead of through temp files. constant_memory is not an
+    # option: pandas writes cells column by column and that mode would drop earlier rows.
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter", engine_kwargs={"options": {"in_memory": True}}) as writer:
+        # All resources
+        _filtered_df[list(display_cols)].to_excel(writer, index=False, sheet_name="All Resources")
+
+        # Teacher summary
+        _teacher_summary.to_excel(writer, index=False, sheet_name="Teacher Summary")
+
+        # Subject summary
+        _subject_summary.to_excel(writer, index=False, sheet_name="Subject Summary")
+
+        # Combined summary
+        _summary.to_excel(writer, index=False, sheet_name="Detailed Summary")
+
+        # Native Excel pie chart over the teacher rows of the Total column
+        last_row = len(_summary) - 1
+        if last_row > 0:
+            total_col = _summary.columns.get_loc("Total")
+            chart = writer.book.add_chart({"type": "pie"})
+            chart.add_series({
+                "name": "Total Resources by Teacher",
+                "categories": ["Detailed Summary", 1, 0, last_row, 0],
+                "values": ["Detailed Summary", 1, total_col, last_row, total_col],
+                "data_labels": {"percentage": True},
+            })
+            writer.sheets["Detailed Summary"].insert_chart(1, total_col + 2, chart)
+
+    return output.getvalue()
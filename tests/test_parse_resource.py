@@ -0,0 +1,165 @@
+import datetime as dt
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from resource_summary.core import iter_row_chunks, parse_resource
+
+SS_NAMESPACE = "urn:schemas-microsoft-com:office:spreadsheet"
+
+
+def xlsx_bytes(rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def spreadsheet_xml(rows):
+    body = "".join(f"<Row>{row}</Row>" for row in rows)
+    return (
+        f'<?xml version="1.0"?><Workbook xmlns="{SS_NAMESPACE}" xmlns:ss="{SS_NAMESPACE}">'
+        f"<Worksheet><Table>{body}</Table></Worksheet></Workbook>"
+    ).encode()
+
+
+def cells(*values):
+    return "".join("<Cell/>" if value is None else f"<Cell><Data>{value}</Data></Cell>" for value in values)
+
+
+HEADER = cells("Title", "Subject", "Created By", "Created Date")
+
+
+def test_xml_rows_are_trimmed_and_teacher_column_renamed():
+    data = spreadsheet_xml([
+        HEADER,
+        cells(" Intro ", "Math", " Ann ", "2024-03-01"),
+        cells("Quiz", "Science", None, "2024-03-02"),
+        cells("Essay", None, "Bob", None),
+    ])
+
+    df, skip_reason = parse_resource("resources.xml", data)
+
+    assert skip_reason is None
+    assert list(df.columns) == ["Title", "Subject", "Teacher Name", "Created Date"]
+    assert df["Title"].tolist() == ["Intro", "Essay"]
+    assert df["Subject"].tolist() == ["Math", ""]
+    assert df["Teacher Name"].tolist() == ["Ann", "Bob"]
+    assert df["Created Date"].iloc[0] == pd.Timestamp("2024-03-01")
+    assert pd.isna(df["Created Date"].iloc[1])
+
+
+def test_xml_short_rows_are_padded_with_nulls():
+    data = spreadsheet_xml([
+        cells("Title", "Teacher Name", "Subject", "Created Date"),
+        cells("Intro", "Ann"),
+        cells("Quiz", "Bob", "Math"),
+    ])
+
+    df, skip_reason = parse_resource("short.xml", data)
+
+    assert skip_reason is None
+    assert df["Subject"].isna().tolist() == [True, False]
+    assert df["Created Date"].isna().tolist() == [True, True]
+
+
+def test_xml_row_wider_than_header_raises():
+    data = spreadsheet_xml([
+        cells("Title", "Subject", "Teacher Name"),
+        cells("Intro", "Math", "Ann", "extra"),
+    ])
+
+    with pytest.raises(ValueError, match="3 columns passed, passed data had 4 columns"):
+        parse_resource("wide.xml", data)
+
+
+def test_xml_missing_table_and_insufficient_rows_are_reported_separately():
+    no_table = f'<?xml version="1.0"?><Workbook xmlns="{SS_NAMESPACE}"><Worksheet/></Workbook>'.encode()
+
+    assert parse_resource("none.xml", no_table) == (None, "⚠️ Skipped none.xml due to missing XML table.")
+    assert parse_resource("empty.xml", spreadsheet_xml([])) == (
+        None,
+        "⚠️ Skipped empty.xml due to insufficient rows.",
+    )
+    assert parse_resource("header.xml", spreadsheet_xml([HEADER])) == (
+        None,
+        "⚠️ Skipped header.xml due to insufficient rows.",
+    )
+
+
+def test_iter_row_chunks_splits_rows_at_chunk_size():
+    data = spreadsheet_xml([cells(str(i), None) for i in range(5)])
+
+    chunks = list(iter_row_chunks(data, chunk_size=2))
+
+    assert chunks == [[["0", ""], ["1", ""]], [["2", ""], ["3", ""]], [["4", ""]]]
+
+
+def test_xml_rows_across_chunk_boundary_are_all_kept():
+    rows = [HEADER] + [cells(f"T{i}", "Math", f"Teacher {i % 3}", "2024-01-01") for i in range(10005)]
+
+    df, skip_reason = parse_resource("large.xml", spreadsheet_xml(rows))
+
+    assert skip_reason is None
+    assert len(df) == 10005
+    assert df["Title"].iloc[[0, 9999, 10000, 10004]].tolist() == ["T0", "T9999", "T10000", "T10004"]
+    assert df["Teacher Name"].iloc[10004] == "Teacher 2"
+
+
+def test_xml_comments_and_rich_text_stay_in_their_cells():
+    data = spreadsheet_xml([
+        cells("Title", "Subject", "Teacher Name"),
+        cells("T<!--c-->U", "Math<!-- x -->s", None),
+        '<Cell><ss:Data xmlns="http://www.w3.org/TR/REC-html40">Intro <B>bold</B> part</ss:Data></Cell>'
+        + cells(None, "Bob"),
+        cells("a<?pi x?>b", "Science", " Ann "),
+    ])
+
+    df, skip_reason = parse_resource("comments.xml", data)
+
+    assert skip_reason is None
+    assert df.to_dict("records") == [
+        {"Title": "Intro", "Subject": "", "Teacher Name": "Bob"},
+        {"Title": "ab", "Subject": "Science", "Teacher Name": "Ann"},
+    ]
+
+
+def test_csv_and_xlsx_skip_files_without_required_columns():
+    assert parse_resource("no_title.csv", b"Subject,Teacher Name\nMath,Ann\n") == (
+        None,
+        "⚠️ Skipped no_title.csv due to missing Title column.",
+    )
+    assert parse_resource("no_teacher.xlsx", xlsx_bytes([["Title", "Subject"], ["Intro", "Math"]])) == (
+        None,
+        "⚠️ Skipped no_teacher.xlsx due to unknown teacher column.",
+    )
+
+
+def test_csv_short_row_is_padded():
+    data = b"Title,Subject,Teacher Name,Created Date\na,M,T,2024-01-01\nb,S,U\n"
+
+    df, skip_reason = parse_resource("short.csv", data)
+
+    assert skip_reason is None
+    assert df["Title"].tolist() == ["a", "b"]
+    assert df["Teacher Name"].tolist() == ["T", "U"]
+    assert df["Created Date"].tolist()[0] == pd.Timestamp("2024-01-01")
+    assert pd.isna(df["Created Date"].tolist()[1])
+
+
+def test_xlsx_mixed_date_column_keeps_text_dates():
+    data = xlsx_bytes([
+        ["Title", "Subject", "Created By", "Created Date"],
+        ["a", "Math", "Ann", dt.datetime(2024, 1, 5)],
+        ["b", "Math", " Bob ", "2024-02-05"],
+    ])
+
+    df, skip_reason = parse_resource("mixed.xlsx", data)
+
+    assert skip_reason is None
+    assert df["Teacher Name"].tolist() == ["Ann", "Bob"]
+    assert df["Created Date"].tolist() == [pd.Timestamp("2024-01-05"), pd.Timestamp("2024-02-05")]